@@ -5,49 +5,68 @@ from bs4 import BeautifulSoup
 LOGS_URL = "https://police.charlotte.edu/police-log/police-log-2025/"
 PDF_DIR = "pdfs_2025"
 PROCESSED_FILES_RECORD = ".github/processed_files.txt"
+REQUEST_TIMEOUT = 30
 
-print("Checking for new police logs...")
+def load_processed_files():
+    os.makedirs(PDF_DIR, exist_ok=True)
+    os.makedirs(os.path.dirname(PROCESSED_FILES_RECORD), exist_ok=True)
 
-os.makedirs(PDF_DIR, exist_ok=True)
-os.makedirs(os.path.dirname(PROCESSED_FILES_RECORD), exist_ok=True)
+    if os.path.exists(PROCESSED_FILES_RECORD):
+        with open(PROCESSED_FILES_RECORD, 'r') as f:
+            return set(line.strip() for line in f.readlines())
 
-if os.path.exists(PROCESSED_FILES_RECORD):
-    with open(PROCESSED_FILES_RECORD, 'r') as f:
-        processed_files = set(line.strip() for line in f.readlines())
-else:
-    processed_files = set()
     with open(PROCESSED_FILES_RECORD, 'w') as f:
         f.write("")
+    return set()
 
-response = requests.get(LOGS_URL)
-soup = BeautifulSoup(response.text, 'html.parser')
-
-new_logs_found = False
-for a_tag in soup.find_all('a', href=True):
-    href = a_tag['href']
-    if href.endswith('.pdf') and '2025' in href:
-        filename = os.path.basename(href)
-        
-        if filename in processed_files:
-            print(f"Already processed: {filename}")
-            continue
-        
-        new_logs_found = True
-        print(f"Found new log: {filename}")
-        
-        pdf_response = requests.get(href)
-        pdf_path = os.path.join(PDF_DIR, filename)
-        
-        with open(pdf_path, 'wb') as f:
-            f.write(pdf_response.content)
-        
-        print(f"Downloaded to: {pdf_path}")
-        
-        with open(PROCESSED_FILES_RECORD, 'a') as f:
-            f.write(f"{filename}\n")
-        processed_files.add(filename)
-
-if not new_logs_found:
-    print("No new logs found.")
-else:
-    print(f"Downloaded {new_logs_found} new log files.")
\ No newline at end of file
+def mark_processed(filename, processed_files):
+    with open(PROCESSED_FILES_RECORD, 'a') as f:
+        f.write(f"{filename}\n")
+    processed_files.add(filename)
+
+def download_new_logs(session, processed_files):
+    response = session.get(LOGS_URL, timeout=REQUEST_TIMEOUT)
+    response.raise_for_status()
+    soup = BeautifulSoup(response.text, 'html.parser')
+
+    downloaded = []
+    for a_tag in soup.find_all('a', href=True):
+        href = a_tag['href']
+        if href.endswith('.pdf') and '2025' in href:
+            filename = os.path.basename(href)
+
+            if filename in processed_files:
+                print(f"Already processed: {filename}")
+                continue
+
+            pdf_path = os.path.join(PDF_DIR, filename)
+            if os.path.exists(pdf_path):
+                print(f"Already downloaded: {pdf_path}")
+                downloaded.append(pdf_path)
+                continue
+
+            print(f"Found new log: {filename}")
+
+            pdf_response = session.get(href, timeout=REQUEST_TIMEOUT)
+            pdf_response.raise_for_status()
+
+            with open(pdf_path, 'wb') as f:
+                f.write(pdf_response.content)
+
+            print(f"Downloaded to: {pdf_path}")
+            downloaded.append(pdf_path)
+
+    return downloaded
+
+if __name__ == "__main__":
+    print("Checking for new police logs...")
+
+    processed_files = load_processed_files()
+    downloaded = download_new_logs(requests.Session(), processed_files)
+    for pdf_path in downloaded:
+        mark_processed(os.path.basename(pdf_path), processed_files)
+
+    if not downloaded:
+        print("No new logs found.")
+    else:
+        print(f"Downloaded {len(downloaded)} new log files.")
@@ -0,0 +1,105 @@
+import os
+import sys
+import json
+import mmap
+import hashlib
+
+CORPUS_DIR = "corpus"
+CORPUS_DATA = os.path.join(CORPUS_DIR, "texts.bin")
+CORPUS_INDEX = os.path.join(CORPUS_DIR, "index.json")
+
+def load_index():
+    if not os.path.exists(CORPUS_INDEX):
+        return {"files": {}, "hashes": {}}
+    with open(CORPUS_INDEX, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def save_index(index):
+    tmp_path = CORPUS_INDEX + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(index, f, indent=2, sort_keys=True)
+        f.write("\n")
+    os.replace(tmp_path, CORPUS_INDEX)
+
+def append_texts(texts):
+    os.makedirs(CORPUS_DIR, exist_ok=True)
+    index = load_index()
+    appended = 0
+    with open(CORPUS_DATA, "ab") as data:
+        for filename, text in texts:
+            encoded = text.encode("utf-8")
+            sha256 = hashlib.sha256(encoded).hexdigest()
+            if index["files"].get(filename) == sha256:
+                continue
+            index["files"][filename] = sha256
+            appended += 1
+            if sha256 in index["hashes"]:
+                continue
+            index["hashes"][sha256] = {"offset": data.tell(), "length": len(encoded)}
+            data.write(encoded)
+        data.flush()
+        os.fsync(data.fileno())
+    if appended:
+        save_index(index)
+    return appended
+
+def append_text(filename, text):
+    return append_texts([(filename, text)])
+
+class Corpus:
+    def __init__(self):
+        self.index = load_index()
+        self._file = None
+        self._map = None
+
+    def __enter__(self):
+        needed = max((entry["offset"] + entry["length"] for entry in self.index["hashes"].values()), default=0)
+        size = os.path.getsize(CORPUS_DATA) if os.path.exists(CORPUS_DATA) else 0
+        if size < needed:
+            raise RuntimeError(f"{CORPUS_DATA} is missing or truncated ({size} of {needed} bytes indexed in {CORPUS_INDEX})")
+        if size:
+            self._file = open(CORPUS_DATA, "rb")
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        return self
+
+    def __exit__(self, *exc_info):
+        if self._map is not None:
+            self._map.close()
+            self._file.close()
+
+    def _slice(self, entry):
+        if not entry["length"]:
+            return ""
+        return self._map[entry["offset"]:entry["offset"] + entry["length"]].decode("utf-8")
+
+    def read(self, filename):
+        sha256 = self.index["files"].get(filename)
+        if sha256 is None:
+            return None
+        return self._slice(self.index["hashes"][sha256])
+
+    def read_by_hash(self, sha256):
+        entry = self.index["hashes"].get(sha256)
+        if entry is None:
+            return None
+        return self._slice(entry)
+
+    def filenames(self):
+        hashes = self.index["hashes"]
+        return sorted(self.index["files"], key=lambda filename: hashes[self.index["files"][filename]]["offset"])
+
+    def iter_texts(self):
+        for filename in self.filenames():
+            yield filename, self.read(filename)
+
+def pack_directory(path):
+    def read_texts():
+        for fname in sorted(os.listdir(path)):
+            if fname.endswith(".txt"):
+                with open(os.path.join(path, fname), "r", encoding="utf-8") as f:
+                    yield fname, f.read()
+    return append_texts(read_texts())
+
+if __name__ == "__main__":
+    source_dir = sys.argv[1] if len(sys.argv) > 1 else "txt_exports"
+    print(f"Packed {pack_directory(source_dir)} new texts from {source_dir} into {CORPUS_DATA}")
@@ -1,15 +1,29 @@
 import re
 import uuid
 import datetime
+import functools
+import hashlib
+import json
+import sys
 from supabase import create_client, Client
 import pdfplumber
 import os
+from search_index import tokenize_description, update_search_index, rebuild_search_index
+from corpus import Corpus, append_text
 
 SUPABASE_URL = os.environ.get("SUPABASE_URL", "")
 SUPABASE_KEY = os.environ.get("SUPABASE_KEY", "")
 PDF_DIR = "pdfs_2025"
 TXT_DIR = "txt_exports"
 FAILED_EXPORT = "failed_incidents.txt"
+DATE_FORMATS = ["%m/%d/%Y", "%m-%d-%Y"]
+DATE_CACHE_SIZE = 4096
+CRIME_LOG = "crime"
+FIRE_LOG = "fire"
+PARSE_MANIFEST = ".github/parse_manifest.json"
+PARSER_VERSION = 2
+OVERLAP_DAYS = 7
+SUPABASE_PAGE_SIZE = 1000
 
 incident_type_set = set([
     "911 Hang Up",
@@ -541,181 +555,530 @@ incident_location_set = set([
     "Woodward Hall"
 ])
 
+VOCABULARY_VERSION = hashlib.sha1(
+    "\n".join(sorted(incident_type_set) + [""] + sorted(incident_location_set)).encode("utf-8")
+).hexdigest()[:8]
+PARSER_VERSION_TAG = f"{PARSER_VERSION}-{VOCABULARY_VERSION}"
+
 supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
 
-def convert_pdfs_to_text():
+def convert_pdf_to_text(path):
     os.makedirs(TXT_DIR, exist_ok=True)
+    with pdfplumber.open(path) as pdf:
+        all_text = "\n".join(page.extract_text() for page in pdf.pages if page.extract_text())
+    txt_path = os.path.join(TXT_DIR, os.path.basename(path).replace(".pdf", ".txt"))
+    with open(txt_path, "w", encoding="utf-8") as out:
+        out.write(all_text)
+    append_text(os.path.basename(txt_path), all_text)
+    return txt_path
+
+def convert_pdfs_to_text():
+    txt_paths = []
     for fname in os.listdir(PDF_DIR):
         if fname.lower().endswith(".pdf"):
-            path = os.path.join(PDF_DIR, fname)
-            with pdfplumber.open(path) as pdf:
-                all_text = "\n".join(page.extract_text() for page in pdf.pages if page.extract_text())
-            with open(os.path.join(TXT_DIR, fname.replace(".pdf", ".txt")), "w", encoding="utf-8") as out:
-                out.write(all_text)
+            txt_paths.append(convert_pdf_to_text(os.path.join(PDF_DIR, fname)))
+    return txt_paths
+
+def load_parse_manifest():
+    if not os.path.exists(PARSE_MANIFEST):
+        return {}
+    with open(PARSE_MANIFEST, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def record_parsed_file(path, manifest=None):
+    manifest = load_parse_manifest() if manifest is None else manifest
+    manifest[os.path.basename(path)] = PARSER_VERSION_TAG
+    with open(PARSE_MANIFEST, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+class Incident:
+    __slots__ = (
+        "report_number",
+        "incident_type",
+        "incident_location",
+        "date_reported",
+        "time_reported",
+        "time_secured",
+        "time_of_occurrence",
+        "disposition",
+        "incident_description",
+        "normalized_date",
+        "normalized_time_reported",
+        "search_tokens",
+    )
+
+    def __init__(self, report_number):
+        self.report_number = report_number
+        self.incident_type = ""
+        self.incident_location = ""
+        self.date_reported = ""
+        self.time_reported = ""
+        self.time_secured = "N/A"
+        self.time_of_occurrence = "N/A"
+        self.disposition = ""
+        self.incident_description = ""
+        self.normalized_date = None
+        self.normalized_time_reported = None
+        self.search_tokens = []
+
+class FireLogEntry:
+    __slots__ = (
+        "report_number",
+        "nature_of_fire",
+        "fire_location",
+        "date_reported",
+        "time_reported",
+        "time_secured",
+        "time_of_occurrence",
+        "disposition",
+        "description",
+    )
+
+    def __init__(self, report_number):
+        self.report_number = report_number
+        self.nature_of_fire = ""
+        self.fire_location = ""
+        self.date_reported = ""
+        self.time_reported = ""
+        self.time_secured = "N/A"
+        self.time_of_occurrence = "N/A"
+        self.disposition = ""
+        self.description = ""
+
+@functools.lru_cache(maxsize=DATE_CACHE_SIZE)
+def normalize_date(date_str):
+    for date_format in DATE_FORMATS:
+        try:
+            return datetime.datetime.strptime(date_str, date_format).strftime("%Y-%m-%d")
+        except ValueError:
+            continue
+    return None
 
 def convert_time(date_str, time_str):
-    try:
-        dt = datetime.datetime.strptime(date_str + time_str, "%m/%d/%Y%H%M")
-        return dt.isoformat() + "Z"
-    except:
+    date = normalize_date(date_str)
+    if not date or not re.fullmatch(r"\d{4}", time_str):
+        return None
+    hours, minutes = int(time_str[:2]), int(time_str[2:])
+    if hours > 23 or minutes > 59:
         return None
+    return f"{date}T{hours:02d}:{minutes:02d}:00Z"
 
-def parse_incidents_from_file(path):
-    with open(path, "r", encoding="utf-8") as file:
-        text = file.read()
-
-    if "CRIME AND ACCIDENT\nLOG" not in text:
-        return []
-    crime_log = text.split("CRIME AND ACCIDENT\nLOG", 1)[-1].split("RESIDENT HALL FIRE\nLOG")[0]
-    lines = crime_log.strip().splitlines()
-    i = 0
-    parsed = []
-
-    while i < len(lines):
-        if lines[i].startswith("CAD/"):
-            current = {
-                "report_number": lines[i].strip(),
-                "incident_type": "",
-                "incident_location": "",
-                "date_reported": "",
-                "time_reported": "",
-                "time_secured": "N/A",
-                "time_of_occurrence": "N/A",
-                "disposition": "",
-                "incident_description": ""
-            }
-            i += 1
-            if i >= len(lines):
-                continue
-            parts = lines[i].split()
-            if len(parts) < 4:
-                print(f"⚠️ Skipping malformed date line in {path} after {current['report_number']}: {lines[i]}")
-                i += 1
+def normalize_incidents(incidents):
+    for item in incidents:
+        item.normalized_date = normalize_date(item.date_reported)
+        item.normalized_time_reported = convert_time(item.date_reported, item.time_reported)
+    return incidents
+
+def clean_description(desc_lines):
+    description = " ".join(desc_lines).strip()
+    description = re.sub(r"^[NS]\s+", "", description)
+    description = re.sub(r"\(Link CAD[^)]+\)", "", description)
+    return re.sub(r"\s{2,}", " ", description).strip()
+
+def parse_crime_record(lines, path):
+    current = Incident(lines[0])
+    if len(lines) < 2:
+        return None
+    parts = lines[1].split()
+    if len(parts) < 4:
+        print(f"⚠️ Skipping malformed date line in {path} after {current.report_number}: {lines[1]}")
+        return None
+    current.date_reported = parts[0]
+    current.time_secured = parts[1]
+    current.time_of_occurrence = parts[2]
+    current.disposition = " ".join(parts[3:])
+
+    meta_parts = lines[2].split() if len(lines) > 2 else []
+    if meta_parts and meta_parts[0] in {"N", "S"}:
+        current.report_number += meta_parts[0]
+        for split_at in range(1, len(meta_parts) - 1):
+            incident_type = " ".join(meta_parts[1:split_at + 1])
+            incident_location = " ".join(meta_parts[split_at + 1:])
+            if incident_type in incident_type_set and incident_location in incident_location_set:
+                current.incident_type = incident_type
+                current.incident_location = incident_location
+                break
+
+    match = re.search(r"(\d{4})hrs", lines[3]) if len(lines) > 3 else None
+    if match:
+        current.time_reported = match.group(1)
+
+    desc_lines = [l for l in lines[4:] if l.upper() not in {"INCIDENT", "DESCRIPTION"}]
+    if desc_lines and len(desc_lines[0].split()) <= 2 and not re.search(r"[.]", desc_lines[0]):
+        desc_lines.pop(0)
+
+    current.incident_description = clean_description(desc_lines)
+    current.search_tokens = tokenize_description(current.incident_description)
+
+    if current.incident_type and current.incident_location:
+        return current
+    return None
+
+def parse_fire_record(lines, path):
+    entry = FireLogEntry(lines[0])
+    if len(lines) < 3:
+        return None
+    parts = lines[1].split()
+    if len(parts) < 4:
+        print(f"⚠️ Skipping malformed fire log date line in {path} after {entry.report_number}: {lines[1]}")
+        return None
+    entry.date_reported = parts[0]
+    entry.time_secured = parts[1]
+    entry.time_of_occurrence = parts[2]
+    entry.disposition = " ".join(parts[3:])
+
+    meta_parts = lines[2].split()
+    if meta_parts and meta_parts[0] in {"N", "S"}:
+        entry.report_number += meta_parts.pop(0)
+    for split_at in range(1, len(meta_parts)):
+        fire_location = " ".join(meta_parts[split_at:])
+        if fire_location in incident_location_set:
+            entry.nature_of_fire = " ".join(meta_parts[:split_at])
+            entry.fire_location = fire_location
+            break
+
+    match = re.search(r"(\d{4})hrs", lines[3]) if len(lines) > 3 else None
+    if match:
+        entry.time_reported = match.group(1)
+
+    entry.description = clean_description(
+        l for l in lines[4:] if l.upper() not in {"INCIDENT", "DESCRIPTION"}
+    )
+
+    if entry.nature_of_fire and entry.fire_location:
+        return entry
+    return None
+
+section_headers = {
+    "CRIME AND ACCIDENT": CRIME_LOG,
+    "RESIDENT HALL FIRE": FIRE_LOG,
+}
+
+record_parsers = {
+    CRIME_LOG: parse_crime_record,
+    FIRE_LOG: parse_fire_record,
+}
+
+def iter_section_lines(lines):
+    section = None
+    pending = None
+    for raw_line in lines:
+        line = raw_line.strip()
+        if pending is not None:
+            header, header_line = pending
+            pending = None
+            if line == "LOG":
+                section = section_headers[header]
                 continue
-            current["date_reported"] = parts[0]
-            current["time_secured"] = parts[1]
-            current["time_of_occurrence"] = parts[2]
-            current["disposition"] = " ".join(parts[3:])
-
-            i += 1
-            meta_parts = lines[i].split()
-            if meta_parts and meta_parts[0] in {"N", "S"}:
-                current["report_number"] += meta_parts[0]
-                for split_at in range(1, len(meta_parts) - 1):
-                    incident_type = " ".join(meta_parts[1:split_at + 1])
-                    incident_location = " ".join(meta_parts[split_at + 1:])
-                    if incident_type in incident_type_set and incident_location in incident_location_set:
-                        current["incident_type"] = incident_type
-                        current["incident_location"] = incident_location
-                        break
-
-            i += 1
-            match = re.search(r"(\d{4})hrs", lines[i])
-            if match:
-                current["time_reported"] = match.group(1)
-
-            i += 1
-            desc_lines = []
-            while i < len(lines):
-                l = lines[i].strip()
-                if l.startswith("CAD/") or "RESIDENT HALL FIRE" in l:
-                    break
-                if l.upper() in {"INCIDENT", "DESCRIPTION"}:
-                    i += 1
-                    continue
-                desc_lines.append(l)
-                i += 1
-
-            if desc_lines and len(desc_lines[0].split()) <= 2 and not re.search(r"[.]", desc_lines[0]):
-                desc_lines.pop(0)
-
-            description = " ".join(desc_lines).strip()
-            description = re.sub(r"^[NS]\s+", "", description)
-            description = re.sub(r"\(Link CAD[^)]+\)", "", description)
-            description = re.sub(r"\s{2,}", " ", description).strip()
-            current["incident_description"] = description
-
-            if current["incident_type"] and current["incident_location"]:
-                parsed.append(current)
-        else:
-            i += 1
-
-    return parsed
+            if section:
+                yield section, header_line
+        header = next((h for h in section_headers if line.endswith(h)), None)
+        if header:
+            pending = (header, line)
+        elif section:
+            yield section, line
+
+def parse_log_lines(lines, path):
+    records = {CRIME_LOG: [], FIRE_LOG: []}
+    section = None
+    block = []
+
+    def finish_record():
+        if block:
+            record = record_parsers[section](block, path)
+            if record:
+                records[section].append(record)
+
+    for line_section, line in iter_section_lines(lines):
+        if line.startswith("CAD/") or line_section != section:
+            finish_record()
+            block = []
+            section = line_section
+        if block or line.startswith("CAD/"):
+            block.append(line)
+    finish_record()
+
+    return records[CRIME_LOG], records[FIRE_LOG]
+
+def parse_log_file(path):
+    with open(path, "r", encoding="utf-8") as file:
+        return parse_log_lines(file, path)
+
+def parse_incidents_from_file(path):
+    return parse_log_file(path)[0]
 
 def incident_exists(report_number):
     result = supabase.table("crime_incidents").select("id").eq("report_number", report_number).execute()
     return len(result.data) > 0
 
-def insert_to_supabase(incidents):
+def incident_row(item):
+    return {
+        "report_number": item.report_number,
+        "incident_type": item.incident_type,
+        "incident_location": item.incident_location,
+        "date_reported": item.normalized_date,
+        "time_reported": item.normalized_time_reported,
+        "time_secured": item.time_secured,
+        "time_of_occurrence": item.time_of_occurrence,
+        "disposition": item.disposition,
+        "incident_description": item.incident_description,
+        "parser_version": PARSER_VERSION_TAG
+    }
+
+def fetch_high_water_mark():
+    result = (
+        supabase.table("crime_incidents")
+        .select("date_reported, report_number")
+        .lte("date_reported", datetime.date.today().isoformat())
+        .order("date_reported", desc=True)
+        .order("report_number", desc=True)
+        .limit(1)
+        .execute()
+    )
+    if not result.data:
+        return None
+    return result.data[0]
+
+def fetch_stored_rows(table, report_numbers, columns="*"):
+    stored = {}
+    report_numbers = list(report_numbers)
+    for start in range(0, len(report_numbers), 100):
+        result = supabase.table(table).select(columns).in_("report_number", report_numbers[start:start + 100]).execute()
+        for row in result.data:
+            stored[row["report_number"]] = row
+    return stored
+
+def existing_report_numbers(table, report_numbers):
+    return set(fetch_stored_rows(table, report_numbers, "report_number"))
+
+def below_high_water_mark(incidents, high_water_mark):
+    newest_parsed = max((item.normalized_date for item in incidents if item.normalized_date), default=None)
+    mark = min(high_water_mark["date_reported"], newest_parsed or high_water_mark["date_reported"])
+    cutoff = (datetime.date.fromisoformat(mark) - datetime.timedelta(days=OVERLAP_DAYS)).isoformat()
+    old, recent = [], []
+    for item in incidents:
+        (old if item.normalized_date and item.normalized_date < cutoff else recent).append(item)
+    return old, recent, cutoff
+
+def insert_to_supabase(incidents, high_water_mark=None, existing=None):
     added_count = 0
     skipped_count = 0
+    below_mark_count = 0
+    stored_items = []
+    normalize_incidents(incidents)
     with open(FAILED_EXPORT, "a", encoding="utf-8") as fail_log:
+        if high_water_mark and existing is None:
+            old, incidents, cutoff = below_high_water_mark(incidents, high_water_mark)
+            below_mark_count = len(old)
+            if old:
+                print(f"📋 Skipping {len(old)} records dated before {cutoff} (high-water mark {high_water_mark['report_number']})")
+            existing = existing_report_numbers("crime_incidents", (item.report_number for item in incidents))
         for item in incidents:
-            if incident_exists(item["report_number"]):
-                print(f"📋 Skipping existing record: {item['report_number']}")
+            exists = item.report_number in existing if existing is not None else incident_exists(item.report_number)
+            if exists:
+                print(f"📋 Skipping existing record: {item.report_number}")
                 skipped_count += 1
+                stored_items.append(item)
                 continue
                 
-            try:
-                date_formats = ["%m/%d/%Y", "%m-%d-%Y"]
-                parsed_date = None
-                
-                for format in date_formats:
-                    try:
-                        parsed_date = datetime.datetime.strptime(item['date_reported'], format)
-                        break
-                    except ValueError:
-                        continue
-                
-                if parsed_date:
-                    date_str = parsed_date.strftime("%Y-%m-%d")
-                else:
-                    raise ValueError(f"Could not parse date: {item['date_reported']}")
-                    
-            except ValueError as e:
-                print(f"❌ Skipping bad date: {item['date_reported']} in report {item['report_number']}")
-                fail_log.write(f"Bad date format: {item['report_number']} | {item['date_reported']}\n")
+            if not item.normalized_date:
+                print(f"❌ Skipping bad date: {item.date_reported} in report {item.report_number}")
+                fail_log.write(f"Bad date format: {item.report_number} | {item.date_reported}\n")
                 continue
 
-            data = {
-                "id": str(uuid.uuid4()),
-                "report_number": item["report_number"],
-                "incident_type": item["incident_type"],
-                "incident_location": item["incident_location"],
-                "date_reported": date_str,
-                "time_reported": convert_time(item["date_reported"], item["time_reported"]),
-                "time_secured": item["time_secured"],
-                "time_of_occurrence": item["time_of_occurrence"],
-                "disposition": item["disposition"],
-                "incident_description": item["incident_description"]
-            }
+            data = incident_row(item)
+            data["id"] = str(uuid.uuid4())
 
             try:
                 supabase.table("crime_incidents").insert(data).execute()
                 added_count += 1
-                print(f"✅ Added incident: {item['report_number']}")
+                stored_items.append(item)
+                print(f"✅ Added incident: {item.report_number}")
             except Exception as e:
-                print(f"❌ Failed to insert {item['report_number']}: {e}")
-                fail_log.write(f"Insert fail: {item['report_number']} | {str(e)}\n")
+                print(f"❌ Failed to insert {item.report_number}: {e}")
+                fail_log.write(f"Insert fail: {item.report_number} | {str(e)}\n")
     
-    return added_count, skipped_count
+    return added_count, skipped_count, below_mark_count, stored_items
+
+def fire_log_entry_exists(report_number):
+    result = supabase.table("fire_log_entries").select("id").eq("report_number", report_number).execute()
+    return len(result.data) > 0
+
+def fire_log_row(entry):
+    return {
+        "report_number": entry.report_number,
+        "nature_of_fire": entry.nature_of_fire,
+        "fire_location": entry.fire_location,
+        "date_reported": normalize_date(entry.date_reported),
+        "time_reported": convert_time(entry.date_reported, entry.time_reported),
+        "time_secured": entry.time_secured,
+        "time_of_occurrence": entry.time_of_occurrence,
+        "disposition": entry.disposition,
+        "description": entry.description,
+        "parser_version": PARSER_VERSION_TAG
+    }
+
+def insert_fire_log_to_supabase(entries, existing=None):
+    added_count = 0
+    with open(FAILED_EXPORT, "a", encoding="utf-8") as fail_log:
+        for entry in entries:
+            exists = entry.report_number in existing if existing is not None else fire_log_entry_exists(entry.report_number)
+            if exists:
+                print(f"📋 Skipping existing fire log entry: {entry.report_number}")
+                continue
+
+            data = fire_log_row(entry)
+            if not data["date_reported"]:
+                print(f"❌ Skipping bad date: {entry.date_reported} in fire log entry {entry.report_number}")
+                fail_log.write(f"Bad date format: {entry.report_number} | {entry.date_reported}\n")
+                continue
+            data["id"] = str(uuid.uuid4())
+
+            try:
+                supabase.table("fire_log_entries").insert(data).execute()
+                added_count += 1
+                print(f"✅ Added fire log entry: {entry.report_number}")
+            except Exception as e:
+                print(f"❌ Failed to insert fire log entry {entry.report_number}: {e}")
+                fail_log.write(f"Insert fail: {entry.report_number} | {str(e)}\n")
+
+    return added_count
+
+def process_text_file(path, high_water_mark=None):
+    parsed, fire_entries = parse_log_file(path)
+    added, skipped, below_mark, stored_items = insert_to_supabase(parsed, high_water_mark)
+    update_search_index(stored_items)
+    insert_fire_log_to_supabase(
+        fire_entries,
+        existing_report_numbers("fire_log_entries", (entry.report_number for entry in fire_entries))
+    )
+    record_parsed_file(path)
+    print(f"Processed {len(parsed)} incidents and {len(fire_entries)} fire log entries from {os.path.basename(path)}")
+    return len(parsed), added, skipped, below_mark
+
+def utc_timestamp(value):
+    dt = datetime.datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+    return dt
+
+def same_value(stored, new):
+    if stored == new:
+        return True
+    if stored is None or new is None:
+        return False
+    try:
+        return utc_timestamp(stored) == utc_timestamp(new)
+    except ValueError:
+        return str(stored) == str(new)
+
+def row_changed(stored, data):
+    return any(
+        not same_value(stored.get(key), value)
+        for key, value in data.items()
+        if key != "parser_version"
+    )
+
+def update_changed_rows(table, rows, stored):
+    updated = 0
+    current = set()
+    for report_number, data in rows.items():
+        if not row_changed(stored[report_number], data):
+            current.add(report_number)
+            continue
+        try:
+            supabase.table(table).update(data).eq("report_number", report_number).execute()
+            updated += 1
+            current.add(report_number)
+            print(f"🔄 Updated {table} row: {report_number}")
+        except Exception as e:
+            print(f"❌ Failed to update {table} row {report_number}: {e}")
+    return updated, current
+
+def reprocess_text(fname, text):
+    parsed, fire_entries = parse_log_lines(text.splitlines(), fname)
+    normalize_incidents(parsed)
+
+    stored = fetch_stored_rows("crime_incidents", (item.report_number for item in parsed))
+    new_items = [item for item in parsed if item.report_number not in stored]
+    added, _, _, stored_items = insert_to_supabase(new_items, existing=set())
+    rows = {
+        item.report_number: incident_row(item)
+        for item in parsed
+        if item.report_number in stored and item.normalized_date
+    }
+    updated, current = update_changed_rows("crime_incidents", rows, stored)
+    stored_items.extend(item for item in parsed if item.report_number in current)
+    update_search_index(stored_items)
+
+    stored_fire = fetch_stored_rows("fire_log_entries", (entry.report_number for entry in fire_entries))
+    added += insert_fire_log_to_supabase(
+        [entry for entry in fire_entries if entry.report_number not in stored_fire],
+        existing=set()
+    )
+    fire_rows = {
+        entry.report_number: fire_log_row(entry)
+        for entry in fire_entries
+        if entry.report_number in stored_fire and normalize_date(entry.date_reported)
+    }
+    fire_updated, _ = update_changed_rows("fire_log_entries", fire_rows, stored_fire)
+    return added, updated + fire_updated
+
+def reprocess():
+    manifest = load_parse_manifest()
+    total_added = 0
+    total_updated = 0
+    total_files = 0
+
+    with Corpus() as corpus:
+        stale = [fname for fname in corpus.filenames() if manifest.get(fname) != PARSER_VERSION_TAG]
+        for fname in stale:
+            added, updated = reprocess_text(fname, corpus.read(fname))
+            record_parsed_file(fname, manifest)
+            total_added += added
+            total_updated += updated
+            total_files += 1
+            print(f"Reprocessed {fname}: {added} added, {updated} updated")
+
+    print(f"Reprocess summary: Files: {total_files}, Added: {total_added}, Updated: {total_updated}")
+
+def fetch_all_incident_descriptions():
+    start = 0
+    while True:
+        result = (
+            supabase.table("crime_incidents")
+            .select("report_number, incident_description")
+            .order("report_number")
+            .range(start, start + SUPABASE_PAGE_SIZE - 1)
+            .execute()
+        )
+        for row in result.data:
+            yield row["report_number"], row["incident_description"]
+        if len(result.data) < SUPABASE_PAGE_SIZE:
+            return
+        start += SUPABASE_PAGE_SIZE
 
 if __name__ == "__main__":
-    convert_pdfs_to_text()
+    if "--reprocess" in sys.argv[1:]:
+        reprocess()
+        sys.exit(0)
+
+    if "--rebuild-search-index" in sys.argv[1:]:
+        print(f"Rebuilt search index with {rebuild_search_index(fetch_all_incident_descriptions())} incidents")
+        sys.exit(0)
+
+    high_water_mark = fetch_high_water_mark() if "--incremental" in sys.argv[1:] else None
     total_added = 0
     total_skipped = 0
+    total_below_mark = 0
     total_parsed = 0
     
-    for fname in os.listdir(TXT_DIR):
-        if fname.endswith(".txt"):
-            full_path = os.path.join(TXT_DIR, fname)
-            parsed = parse_incidents_from_file(full_path)
-            total_parsed += len(parsed)
-            
-            added, skipped = insert_to_supabase(parsed)
-            total_added += added
-            total_skipped += skipped
-            
-            print(f"Processed {len(parsed)} incidents from {fname}")
+    for txt_path in convert_pdfs_to_text():
+        parsed, added, skipped, below_mark = process_text_file(txt_path, high_water_mark)
+        total_parsed += parsed
+        total_added += added
+        total_skipped += skipped
+        total_below_mark += below_mark
     
-    print(f"Summary: Total parsed: {total_parsed}, Added: {total_added}, Skipped (already exist): {total_skipped}")
\ No newline at end of file
+    print(f"Summary: Total parsed: {total_parsed}, Added: {total_added}, Skipped (already exist): {total_skipped}, Skipped (below high-water mark): {total_below_mark}")
\ No newline at end of file
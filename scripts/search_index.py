@@ -0,0 +1,91 @@
+import re
+import sys
+import sqlite3
+
+SEARCH_INDEX_DB = "search_index.db"
+
+abbreviations = {
+    "apt": "apartment",
+    "approx": "approximately",
+    "cfd": "charlotte fire department",
+    "cmpd": "charlotte mecklenburg police department",
+    "dept": "department",
+    "info": "information",
+    "ofc": "officer",
+    "ofcr": "officer",
+    "ofcs": "officers",
+    "pps": "police and public safety",
+    "rp": "reporting party",
+    "subj": "subject",
+    "subjs": "subjects",
+    "veh": "vehicle",
+    "vehs": "vehicles",
+}
+
+def tokenize_description(text):
+    text = re.sub(r"\(Link CAD[^)]+\)", "", text)
+    tokens = []
+    for word in re.findall(r"[a-z0-9]+", text.lower()):
+        tokens.extend(abbreviations.get(word, word).split())
+    return tokens
+
+def connect(path=SEARCH_INDEX_DB):
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS indexed_incidents "
+        "(id INTEGER PRIMARY KEY, report_number TEXT UNIQUE NOT NULL)"
+    )
+    conn.execute("CREATE VIRTUAL TABLE IF NOT EXISTS incident_search USING fts5(tokens)")
+    return conn
+
+def update_search_index(incidents, path=SEARCH_INDEX_DB):
+    if not incidents:
+        return
+    conn = connect(path)
+    with conn:
+        conn.executemany(
+            "INSERT OR IGNORE INTO indexed_incidents (report_number) VALUES (?)",
+            [(item.report_number,) for item in incidents]
+        )
+        conn.executemany(
+            "INSERT OR REPLACE INTO incident_search (rowid, tokens) "
+            "SELECT id, ? FROM indexed_incidents WHERE report_number = ?",
+            [(" ".join(item.search_tokens), item.report_number) for item in incidents]
+        )
+    conn.close()
+
+def rebuild_search_index(rows, path=SEARCH_INDEX_DB):
+    conn = connect(path)
+    count = 0
+    with conn:
+        conn.execute("DELETE FROM incident_search")
+        conn.execute("DELETE FROM indexed_incidents")
+        for report_number, description in rows:
+            conn.execute("INSERT OR IGNORE INTO indexed_incidents (report_number) VALUES (?)", (report_number,))
+            conn.execute(
+                "INSERT OR REPLACE INTO incident_search (rowid, tokens) "
+                "SELECT id, ? FROM indexed_incidents WHERE report_number = ?",
+                (" ".join(tokenize_description(description or "")), report_number)
+            )
+            count += 1
+    conn.close()
+    return count
+
+def search(query, limit=50, path=SEARCH_INDEX_DB):
+    tokens = tokenize_description(query)
+    if not tokens:
+        return []
+    match = " ".join(f'"{token}"' for token in tokens)
+    conn = connect(path)
+    rows = conn.execute(
+        "SELECT indexed_incidents.report_number FROM incident_search "
+        "JOIN indexed_incidents ON indexed_incidents.id = incident_search.rowid "
+        "WHERE incident_search MATCH ? ORDER BY rank LIMIT ?",
+        (match, limit)
+    ).fetchall()
+    conn.close()
+    return [row[0] for row in rows]
+
+if __name__ == "__main__":
+    for report_number in search(" ".join(sys.argv[1:])):
+        print(report_number)
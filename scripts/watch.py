@@ -0,0 +1,75 @@
+import os
+import sys
+import time
+import datetime
+from zoneinfo import ZoneInfo
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".github", "scripts"))
+
+import download_new_logs
+import parse
+
+TIMEZONE = ZoneInfo("America/New_York")
+ACTIVE_HOURS = range(7, 13)
+ACTIVE_POLL_SECONDS = 5 * 60
+IDLE_POLL_SECONDS = 15 * 60
+MAX_IDLE_POLL_SECONDS = 60 * 60
+MAX_PROCESS_ATTEMPTS = 3
+FAILED_PDF_DIR = "failed_pdfs"
+
+def next_poll_interval(now, idle_polls):
+    if now.hour in ACTIVE_HOURS:
+        return ACTIVE_POLL_SECONDS
+    return min(IDLE_POLL_SECONDS * 2 ** idle_polls, MAX_IDLE_POLL_SECONDS)
+
+def process_pdf(pdf_path, high_water_mark, processed_files):
+    txt_path = parse.convert_pdf_to_text(pdf_path)
+    try:
+        result = parse.process_text_file(txt_path, high_water_mark)
+    finally:
+        os.remove(txt_path)
+    download_new_logs.mark_processed(os.path.basename(pdf_path), processed_files)
+    os.remove(pdf_path)
+    return result
+
+def set_aside_pdf(pdf_path, processed_files):
+    os.makedirs(FAILED_PDF_DIR, exist_ok=True)
+    filename = os.path.basename(pdf_path)
+    os.replace(pdf_path, os.path.join(FAILED_PDF_DIR, filename))
+    download_new_logs.mark_processed(filename, processed_files)
+    print(f"❌ Giving up on {filename} after {MAX_PROCESS_ATTEMPTS} attempts, moved to {FAILED_PDF_DIR}")
+
+def watch():
+    session = requests.Session()
+    processed_files = download_new_logs.load_processed_files()
+    idle_polls = 0
+    failed_attempts = {}
+
+    while True:
+        try:
+            new_pdfs = download_new_logs.download_new_logs(session, processed_files)
+            high_water_mark = parse.fetch_high_water_mark() if new_pdfs else None
+        except Exception as e:
+            print(f"❌ Failed to check for new logs: {e}")
+            new_pdfs = []
+
+        for pdf_path in new_pdfs:
+            try:
+                process_pdf(pdf_path, high_water_mark, processed_files)
+                failed_attempts.pop(pdf_path, None)
+            except Exception as e:
+                print(f"❌ Failed to process {os.path.basename(pdf_path)}: {e}")
+                failed_attempts[pdf_path] = failed_attempts.get(pdf_path, 0) + 1
+                if failed_attempts[pdf_path] >= MAX_PROCESS_ATTEMPTS:
+                    set_aside_pdf(pdf_path, processed_files)
+                    del failed_attempts[pdf_path]
+
+        idle_polls = 0 if new_pdfs else min(idle_polls + 1, 2)
+        interval = next_poll_interval(datetime.datetime.now(TIMEZONE), idle_polls)
+        print(f"Next check in {interval // 60} minutes")
+        time.sleep(interval)
+
+if __name__ == "__main__":
+    print("Watching for new police logs...")
+    watch()